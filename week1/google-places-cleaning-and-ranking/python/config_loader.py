@@ -1,12 +1,31 @@
 """
 Configuration loader utility for ETL pipeline
+
+YAML is parsed with libyaml's CSafeLoader when PyYAML was built against
+libyaml (the PyPI wheels bundle it; for source builds install the libyaml
+headers, e.g. libyaml-dev, first). Without it the pure-Python SafeLoader
+is used, which gives the same result more slowly.
+
+After parsing, the config is also written as JSON next to the YAML file
+(config.yaml -> config.yaml.json) and read back from there, which is
+much faster than YAML, for as long as the YAML file is unchanged; PyYAML
+is only imported when a YAML file actually has to be parsed. The sidecar
+is a generated file and is ignored by git (*.yaml.json).
 """
-import yaml
+import copy
+import json
+from collections import OrderedDict
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Parsed configs keyed by absolute path, stored as (mtime_ns, size, config) and
+# kept in least-recently-used order; an entry is reused only while the file's
+# mtime and size still match
+_CONFIG_CACHE = OrderedDict()
+_CONFIG_CACHE_SIZE = 100
+
 def load_config(config_path=None):
     """
     Load configuration from YAML file
@@ -16,26 +35,112 @@ def load_config(config_path=None):
     
     Returns:
         dict: Configuration dictionary
+
+    Parsed files are cached (up to 100 paths, least recently used evicted
+    first) until their mtime or size changes; every call returns a fresh
+    copy, so callers may modify the result freely.
     """
     if config_path is None:
         # Try to find config.yaml in parent directory
         script_dir = os.path.dirname(os.path.abspath(__file__))
         config_path = os.path.join(script_dir, "..", "config.yaml")
     
-    if not os.path.exists(config_path):
+    try:
+        f = open(config_path, 'r', encoding='utf-8')
+    except FileNotFoundError:
         logger.warning(f"Config file not found at {config_path}, using defaults")
         return get_default_config()
-    
+    except OSError as e:
+        # Exists but can't be opened (a directory, no read permission, ...)
+        logger.error(f"Error loading config file: {str(e)}")
+        logger.info("Using default configuration")
+        return get_default_config()
+
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        with f:
+            # fstat on the open handle instead of a separate stat on the path
+            st = os.fstat(f.fileno())
+            cache_key = os.path.abspath(config_path)
+            cached = _CONFIG_CACHE.get(cache_key)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                _CONFIG_CACHE.move_to_end(cache_key)
+                return copy.deepcopy(cached[2])
+            config = _read_json_sidecar(config_path, st)
+            if config is None:
+                config = _parse_yaml(f)
+                _write_json_sidecar(config_path, st, config)
+        _CONFIG_CACHE[cache_key] = (st.st_mtime_ns, st.st_size, config)
+        _CONFIG_CACHE.move_to_end(cache_key)
+        if len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+            _CONFIG_CACHE.popitem(last=False)
         logger.info(f"Loaded configuration from {config_path}")
-        return config
+        return copy.deepcopy(config)
     except Exception as e:
         logger.error(f"Error loading config file: {str(e)}")
         logger.info("Using default configuration")
         return get_default_config()
 
+def _parse_yaml(f):
+    """Parse an open YAML file, with libyaml's CSafeLoader when available"""
+    # Imported here: with a current JSON sidecar, YAML is never parsed at all
+    import yaml
+    # libyaml-backed parser; same semantics as SafeLoader, much faster
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(f, Loader=loader)
+
+def _read_json_sidecar(config_path, st):
+    """
+    Return the config stored in the JSON sidecar of config_path
+
+    Args:
+        config_path (str): Path to the YAML config file
+        st (os.stat_result): Current stat of the YAML config file
+
+    Returns:
+        dict: Configuration dictionary, or None if the sidecar is missing,
+        unreadable or was written for a different version of the YAML file
+    """
+    try:
+        with open(config_path + '.json', 'r', encoding='utf-8') as f:
+            sidecar = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(sidecar, dict) or sidecar.get('source') != [st.st_mtime_ns, st.st_size]:
+        return None
+    return sidecar.get('config')
+
+def _write_json_sidecar(config_path, st, config):
+    """
+    Save config as JSON next to config_path, stamped with the YAML file's mtime and size
+
+    The file is written to a temporary name and renamed into place, so a
+    concurrent load never reads a half-written sidecar. Configs that JSON
+    cannot represent exactly (e.g. YAML dates) and unwritable directories
+    are skipped silently; the YAML file is then simply parsed every time.
+    """
+    try:
+        text = json.dumps({'source': [st.st_mtime_ns, st.st_size], 'config': config})
+    except (TypeError, ValueError):
+        return
+    if json.loads(text)['config'] != config:
+        return
+    sidecar_path = config_path + '.json'
+    tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, sidecar_path)
+    except OSError as e:
+        logger.debug(f"Could not write config cache {sidecar_path}: {str(e)}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def clear_config_cache():
+    """Drop all cached configs so the next load re-reads from disk"""
+    _CONFIG_CACHE.clear()
+
 def get_default_config():
     """Return default configuration if config file is not found"""
     return {
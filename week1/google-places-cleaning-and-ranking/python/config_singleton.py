@@ -0,0 +1,32 @@
+"""
+Process-wide configuration shared by the ETL modules
+"""
+from config_loader import load_config
+
+_config = None
+
+def get():
+    """
+    Return the shared configuration, loading the default config.yaml on first use
+
+    Returns:
+        dict: Configuration dictionary
+    """
+    global _config
+    if _config is None:
+        _config = load_config()
+    return _config
+
+def reload(config_path=None):
+    """
+    Load configuration from a file and make it the shared configuration
+
+    Args:
+        config_path (str): Path to config.yaml file. If None, uses the default location.
+
+    Returns:
+        dict: Configuration dictionary
+    """
+    global _config
+    _config = load_config(config_path)
+    return _config
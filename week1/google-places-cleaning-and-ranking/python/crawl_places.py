@@ -1,29 +1,56 @@
-import json
+import gzip
 import time
 import logging
 import argparse
 import os
-from apify_client import ApifyClient
+import orjson
 from dotenv import load_dotenv
-from config_loader import load_config, get_path
+import config_singleton
+from config_loader import get_path
+from logging_setup import configure_logging
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('crawl_places.log'),
-        logging.StreamHandler()
-    ]
-)
+# Library modules shouldn't globally configure logging; defer to caller.
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 load_dotenv()
 
-# Load configuration
-config = load_config()
 APIFY_TOKEN = os.getenv("APIFY_TOKEN")
-ACTOR_ID = get_path(config, 'apify', 'actor_id', default='compass/crawler-google-places')
+
+# ApifyClient per token, reused across crawl_raw calls so its HTTP session and
+# connection pool survive between crawls
+_clients = {}
+
+def _get_client():
+    """Return the shared ApifyClient for the current APIFY_TOKEN, creating it on first use"""
+    client = _clients.get(APIFY_TOKEN)
+    if client is None:
+        # Imported here: apify_client takes ~0.4s to import and is only needed to crawl
+        from apify_client import ApifyClient
+        client = _clients[APIFY_TOKEN] = ApifyClient(APIFY_TOKEN)
+    return client
+
+def _transform_place(place):
+    """Map one Apify item to the Google Places API layout used downstream"""
+    get = place.get
+    return {
+        "place_id": get("placeId"),
+        "name": get("title"),
+        "rating": get("totalScore"),
+        "user_ratings_total": get("reviewsCount"),
+        "geometry": get("placeLocation") or get("location"),
+        "address": get("address"),
+        "types": get("categories"),
+        "reviews": [
+            {
+                "author_name": rev.get("name"),
+                "rating": rev.get("stars"),
+                "text": rev.get("text"),
+                "time": rev.get("publishedAtDate")
+            }
+            for rev in get("reviews") or ()
+        ]
+    }
 
 def crawl_raw(query, save_path="../data/raw/raw_places.json", max_crawled_places=25, max_reviews=5):
     """
@@ -31,7 +58,7 @@ def crawl_raw(query, save_path="../data/raw/raw_places.json", max_crawled_places
     
     Args:
         query (str): Search query for places (e.g., 'billiard, Ho Chi Minh City')
-        save_path (str): Path to save raw JSON data
+        save_path (str): Path to save raw JSON data (gzip-compressed if it ends with .gz)
         max_crawled_places (int): Maximum number of places to crawl (default: 25)
         max_reviews (int): Maximum number of reviews per place (default: 5)
     """
@@ -40,11 +67,13 @@ def crawl_raw(query, save_path="../data/raw/raw_places.json", max_crawled_places
         raise ValueError("Please set APIFY_TOKEN in .env file")
     
     logger.info(f"Initializing Apify client for query: {query}")
-    client = ApifyClient(APIFY_TOKEN)
+    client = _get_client()
 
     # Get config values
-    scrape_detail = get_path(config, 'apify', 'scrape_place_detail_page', default=False)
-    reviews_sort = get_path(config, 'apify', 'reviews_sort', default='newest')
+    cfg = config_singleton.get()
+    actor_id = get_path(cfg, 'apify', 'actor_id', default='compass/crawler-google-places')
+    scrape_detail = get_path(cfg, 'apify', 'scrape_place_detail_page', default=False)
+    reviews_sort = get_path(cfg, 'apify', 'reviews_sort', default='newest')
     
     run_input = {
         "searchStringsArray": [query], 
@@ -56,7 +85,7 @@ def crawl_raw(query, save_path="../data/raw/raw_places.json", max_crawled_places
 
     logger.info(f"Running Apify Google Maps Scraper with query: {query}")
     try:
-        run = client.actor(ACTOR_ID).call(run_input=run_input)
+        run = client.actor(actor_id).call(run_input=run_input)
         logger.info(f"Apify run completed. Run ID: {run.get('id')}")
     except Exception as e:
         logger.error(f"Error calling Apify actor: {str(e)}")
@@ -65,41 +94,44 @@ def crawl_raw(query, save_path="../data/raw/raw_places.json", max_crawled_places
     # Get dataset
     dataset_id = run["defaultDatasetId"]
     logger.info(f"Fetching dataset: {dataset_id}")
-    items = client.dataset(dataset_id).list_items().items
-    logger.info(f"Retrieved {len(items)} places from Apify")
-
-    # Transform (Google Places API format)
-    data = []
-    for place in items:
-        detail = {
-            "place_id": place.get("placeId"),
-            "name": place.get("title"),
-            "rating": place.get("totalScore"),
-            "user_ratings_total": place.get("reviewsCount"),
-            "geometry": place.get("placeLocation") or place.get("location"),
-            "address": place.get("address"),
-            "types": place.get("categories"),
-            "reviews": []
-        }
-        for rev in place.get("reviews", []):
-            detail["reviews"].append({
-                "author_name": rev.get("name"),
-                "rating": rev.get("stars"),
-                "text": rev.get("text"),
-                "time": rev.get("publishedAtDate")
-            })
-        data.append(detail)
+    items = client.dataset(dataset_id).iterate_items()
 
     # Make new folder if does not exist
     os.makedirs(os.path.dirname(save_path), exist_ok=True)
 
-    with open(save_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Transform (Google Places API format) and write each place as it arrives,
+    # so the raw Apify items are never held in memory all at once.
+    # Compact UTF-8 output; the file is consumed by transform_data, not read by hand.
+    # Written to a temporary file and renamed into place, so a crash mid-crawl
+    # never leaves a truncated file at save_path for transform_data to pick up.
+    # Per-process name, so concurrent crawls to the same path never share a temp file
+    tmp_path = f"{save_path}.{os.getpid()}.tmp"
+    opener = gzip.open if save_path.endswith(".gz") else open
+    data = []
+    try:
+        with opener(tmp_path, "wb") as f:
+            f.write(b"[")
+            for place in items:
+                detail = _transform_place(place)
+                if data:
+                    f.write(b",")
+                f.write(orjson.dumps(detail))
+                data.append(detail)
+            f.write(b"]")
+        os.replace(tmp_path, save_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    logger.info(f"Retrieved {len(data)} places from Apify")
 
     logger.info(f"Successfully saved {len(data)} places to {save_path}")
     return data
 
 if __name__ == "__main__":
+    configure_logging('crawl_places.log')
     parser = argparse.ArgumentParser(
         description="Crawl Google Places data using Apify API",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -117,10 +149,11 @@ Examples:
         help="Search query for places (e.g., 'coffee shop, New York'). If not provided, will prompt for input."
     )
     # Get defaults from config
-    default_max_places = get_path(config, 'apify', 'default_max_places', default=25)
-    default_max_reviews = get_path(config, 'apify', 'default_max_reviews', default=5)
-    raw_data_dir = get_path(config, 'paths', 'raw_data_dir', default='../data/raw')
-    default_raw_json = get_path(config, 'paths', 'default_raw_json', default='raw_places.json')
+    cfg = config_singleton.get()
+    default_max_places = get_path(cfg, 'apify', 'default_max_places', default=25)
+    default_max_reviews = get_path(cfg, 'apify', 'default_max_reviews', default=5)
+    raw_data_dir = get_path(cfg, 'paths', 'raw_data_dir', default='../data/raw')
+    default_raw_json = get_path(cfg, 'paths', 'default_raw_json', default='raw_places.json')
     default_output = os.path.join(raw_data_dir, default_raw_json)
     
     parser.add_argument(
@@ -139,7 +172,7 @@ Examples:
         "--output",
         type=str,
         default=default_output,
-        help=f"Path to save raw JSON data (default: {default_output} from config)"
+        help=f"Path to save raw JSON data, gzip-compressed if it ends with .gz (default: {default_output} from config)"
     )
     parser.add_argument(
         "--config",
@@ -152,7 +185,7 @@ Examples:
     
     # Reload config if custom path provided
     if args.config:
-        config = load_config(args.config)
+        config_singleton.reload(args.config)
     
     # If query is not provided, prompt user for input
     query = args.query
@@ -0,0 +1,41 @@
+"""
+Logging setup shared by the command-line entry points
+"""
+import logging
+from logging.handlers import RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+MAX_LOG_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+_configured = False
+
+def configure_logging(log_file, level=logging.INFO):
+    """
+    Send log records to the console and to a rotating log file
+
+    Only the first call installs handlers, so importing several entry-point
+    modules never registers duplicates. The log file is opened when the
+    first record is written, not when this function is called.
+
+    Args:
+        log_file (str): Path of the log file
+        level (int): Root logger level (default: logging.INFO)
+    """
+    global _configured
+    if _configured:
+        return
+
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=MAX_LOG_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding='utf-8',
+        delay=True,
+    )
+    logging.basicConfig(
+        level=level,
+        format=LOG_FORMAT,
+        handlers=[file_handler, logging.StreamHandler()],
+    )
+    _configured = True
@@ -8,27 +8,39 @@ Steps:
 3. Load into SQLite and generate ranked CSV
 """
 import argparse
+import csv
 import logging
 import os
+import re
 import sqlite3
 from typing import List, Optional, Tuple
 
-import pandas as pd
-
-from config_loader import load_config, get_path
+import config_singleton
+from config_loader import get_path
+from logging_setup import configure_logging
 import crawl_places
 import transform_data as transformer
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("pipeline.log"),
-        logging.StreamHandler()
-    ],
-)
+# Logging is configured in main() so importing this module has no side effects
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Whole and decimal numbers as written in the clean CSV
+INTEGER_RE = re.compile(r"[+-]?\d+")
+REAL_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+# List brackets and double quotes around the values of the `types` column
+TYPES_DECORATION_RE = re.compile(r'[\[\]"]')
+
+# The database is a reproducible build output, so durability is traded for bulk-load speed
+SQLITE_BULK_LOAD_PRAGMAS = """
+    PRAGMA journal_mode=MEMORY;
+    PRAGMA synchronous=OFF;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+"""
 
 
 def resolve_file_path(
@@ -53,68 +65,132 @@ def resolve_file_path(
     return os.path.join(base_dir, file_name)
 
 
+def clean_main_type(types: Optional[str]) -> Optional[str]:
+    """Strip list brackets and double quotes from a `types` cell (same result as run.sql)."""
+    if types is None:
+        return None
+    return TYPES_DECORATION_RE.sub("", types).strip(" ")
+
+
+def column_type(values) -> str:
+    """
+    SQLite type for a clean CSV column, as pandas read_csv/to_sql inferred it.
+
+    INTEGER if every cell is a whole number, REAL if the cells are numbers
+    with a decimal or an empty cell among them (or all empty), TEXT otherwise.
+    The declared type decides how values are stored, e.g. "4" in a REAL
+    column is exported as 4.0 and "12.0" in an INTEGER column as 12.
+    """
+    has_value = has_real = has_null = False
+    for value in values:
+        if value is None:
+            has_null = True
+        elif INTEGER_RE.fullmatch(value):
+            has_value = True
+        elif REAL_RE.fullmatch(value):
+            has_value = has_real = True
+        else:
+            return "TEXT"
+    if has_value:
+        return "REAL" if has_real or has_null else "INTEGER"
+    return "REAL" if has_null else "TEXT"
+
+
+def load_places_table(conn: sqlite3.Connection, csv_file) -> int:
+    """
+    Recreate the places table from an open clean CSV file and insert its rows.
+
+    Runs inside the caller's transaction; nothing is committed here.
+    """
+    reader = csv.reader(csv_file)
+    header = next(reader, None)
+    if not header:
+        raise ValueError(f"Clean CSV has no header row: {csv_file.name}")
+
+    # Rows are read before the table is created: column types depend on all values.
+    # Empty cells become NULL.
+    rows = [[value or None for value in row] for row in reader]
+
+    column_defs = ", ".join(
+        '"{}" {}'.format(col.replace('"', '""'), column_type(row[i] for row in rows))
+        for i, col in enumerate(header)
+    )
+    conn.execute("DROP TABLE IF EXISTS places;")
+    conn.execute(f"CREATE TABLE places ({column_defs}, main_type TEXT);")
+
+    # main_type is derived from `types` here rather than by a full-table UPDATE afterwards
+    types_index = header.index("types") if "types" in header else None
+    for values in rows:
+        values.append(clean_main_type(values[types_index]) if types_index is not None else None)
+
+    placeholders = ", ".join("?" * (len(header) + 1))
+    cursor = conn.executemany(f"INSERT INTO places VALUES ({placeholders})", rows)
+    return cursor.rowcount
+
+
 def load_and_rank(clean_csv_path: str, db_path: str, ranked_csv_path: str) -> Tuple[str, str]:
     """Load clean CSV into SQLite, run ranking query, export ranked CSV."""
     logger.info("Loading cleaned data from %s", clean_csv_path)
-    if not os.path.exists(clean_csv_path):
-        raise FileNotFoundError(f"Clean CSV not found: {clean_csv_path}")
-
     os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
     os.makedirs(os.path.dirname(ranked_csv_path) or ".", exist_ok=True)
 
-    conn = sqlite3.connect(db_path)
     try:
-        df = pd.read_csv(clean_csv_path)
-        logger.info("Writing %d rows to SQLite database %s", len(df), db_path)
-        df.to_sql('places', conn, if_exists='replace', index=False)
-
-        conn.execute("ALTER TABLE places ADD COLUMN main_type TEXT;")
-        conn.execute("""
-            UPDATE places
-            SET main_type = TRIM(
-                REPLACE(
-                    REPLACE(
-                        REPLACE(types, '[', ''),
-                        ']', ''),
-                    '"', '')
-            )
-            WHERE main_type IS NULL OR main_type = '';
-        """)
-
-        logger.info("Creating place_ranking table with dense rank")
-        conn.execute("DROP TABLE IF EXISTS place_ranking;")
-        conn.execute("""
-            CREATE TABLE place_ranking AS
-            SELECT
-                place_id,
-                name,
-                rating,
-                user_ratings_total,
-                COALESCE(main_type, types) AS category,
-                DENSE_RANK() OVER (
-                    PARTITION BY COALESCE(main_type, types)
-                    ORDER BY rating DESC, user_ratings_total DESC
-                ) AS rating_rank
-            FROM places;
-        """)
-
-        logger.info("Exporting ranked results to %s", ranked_csv_path)
-        ranked_df = pd.read_sql_query("""
-            SELECT
-                place_id,
-                name,
-                rating,
-                user_ratings_total,
-                category,
-                rating_rank
-            FROM place_ranking
-            ORDER BY category, rating_rank;
-        """, conn)
-        ranked_df.to_csv(ranked_csv_path, index=False, encoding="utf-8-sig")
-
-        conn.commit()
-    finally:
-        conn.close()
+        csv_file = open(clean_csv_path, newline="", encoding="utf-8-sig")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Clean CSV not found: {clean_csv_path}") from None
+
+    # Entered right away so the file is closed whatever fails below
+    with csv_file:
+        # Autocommit mode: the load and ranking below run in one explicit transaction
+        conn = sqlite3.connect(db_path, isolation_level=None)
+        try:
+            conn.executescript(SQLITE_BULK_LOAD_PRAGMAS)
+            conn.execute("BEGIN")
+            row_count = load_places_table(conn, csv_file)
+            logger.info("Wrote %d rows to SQLite database %s", row_count, db_path)
+
+            logger.info("Creating place_ranking table with dense rank")
+            # Matches the window's PARTITION BY / ORDER BY so SQLite can skip the sort step
+            conn.execute("""
+                CREATE INDEX idx_places_rank
+                ON places (COALESCE(main_type, types), rating DESC, user_ratings_total DESC);
+            """)
+            conn.execute("DROP TABLE IF EXISTS place_ranking;")
+            conn.execute("""
+                CREATE TABLE place_ranking AS
+                SELECT
+                    place_id,
+                    name,
+                    rating,
+                    user_ratings_total,
+                    COALESCE(main_type, types) AS category,
+                    DENSE_RANK() OVER (
+                        PARTITION BY COALESCE(main_type, types)
+                        ORDER BY rating DESC, user_ratings_total DESC
+                    ) AS rating_rank
+                FROM places;
+            """)
+            conn.execute("COMMIT")
+
+            logger.info("Exporting ranked results to %s", ranked_csv_path)
+            cursor = conn.execute("""
+                SELECT
+                    place_id,
+                    name,
+                    rating,
+                    user_ratings_total,
+                    category,
+                    rating_rank
+                FROM place_ranking
+                ORDER BY category, rating_rank;
+            """)
+            # Stream rows from SQLite straight to disk instead of materialising a DataFrame
+            with open(ranked_csv_path, "w", newline="", encoding="utf-8-sig") as f:
+                writer = csv.writer(f, lineterminator="\n")
+                writer.writerow([column[0] for column in cursor.description])
+                writer.writerows(cursor)
+        finally:
+            conn.close()
 
     return db_path, ranked_csv_path
 
@@ -126,6 +202,7 @@ def parse_columns(columns_str: Optional[str]) -> Optional[List[str]]:
 
 
 def main():
+    configure_logging("pipeline.log")
     parser = argparse.ArgumentParser(
         description="Run the full Google Places ETL pipeline",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -145,7 +222,7 @@ Examples:
     parser.add_argument("--max-crawled-places", type=int, default=None, help="Max places to crawl (override config)")
     parser.add_argument("--max-reviews", type=int, default=None, help="Max reviews per place (override config)")
 
-    parser.add_argument("--raw-path", type=str, default=None, help="Explicit path to raw JSON file")
+    parser.add_argument("--raw-path", type=str, default=None, help="Explicit path to raw JSON file (.json or gzip-compressed .json.gz)")
     parser.add_argument("--raw-output-name", type=str, default=None, help="File name for raw JSON (stored in raw data dir)")
 
     parser.add_argument("--clean-path", type=str, default=None, help="Explicit path to cleaned CSV")
@@ -171,9 +248,11 @@ Examples:
     if not args.skip_crawl and not args.query:
         parser.error("--query is required unless --skip-crawl is specified")
 
-    config = load_config(args.config)
-    crawl_places.config = config
-    transformer.config = config
+    # Reuse the shared default config; only read YAML again for a custom path
+    if args.config:
+        config = config_singleton.reload(args.config)
+    else:
+        config = config_singleton.get()
 
     raw_dir = get_path(config, 'paths', 'raw_data_dir', default='../data/raw')
     clean_dir = get_path(config, 'paths', 'clean_data_dir', default='../data/clean')
@@ -219,6 +298,7 @@ Examples:
             columns_to_save_override=columns_override,
             default_rating_override=args.default_rating,
             default_reviews_override=args.default_reviews,
+            as_dataframe=False,
         )
     else:
         logger.info("Skipping transform step")
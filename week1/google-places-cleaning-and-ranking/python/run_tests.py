@@ -2,23 +2,104 @@
 """
 Script to run all unit tests
 """
+import io
+import argparse
+import time
 import unittest
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def discover_and_run_tests():
-    """Discover and run all tests in the tests directory"""
+SEP = "=" * 80 + "\n"
+DASH = "-" * 80 + "\n"
+
+def iter_test_cases(suite):
+    """Yield the individual test cases of a (nested) test suite"""
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from iter_test_cases(item)
+        else:
+            yield item
+
+def run_test_class(class_name):
+    """
+    Run one test class in a worker process
+
+    Returns picklable results: the captured runner output plus the
+    (test, traceback) string pairs of each outcome list.
+    """
+    suite = unittest.TestLoader().loadTestsFromName(class_name)
+    stream = io.StringIO()
+    result = unittest.TextTestRunner(stream=stream, verbosity=2).run(suite)
+    return {
+        'output': stream.getvalue(),
+        'testsRun': result.testsRun,
+        'failures': [(str(test), tb) for test, tb in result.failures],
+        'errors': [(str(test), tb) for test, tb in result.errors],
+        'skipped': [(str(test), reason) for test, reason in result.skipped],
+        'expectedFailures': [(str(test), tb) for test, tb in result.expectedFailures],
+        'unexpectedSuccesses': [str(test) for test in result.unexpectedSuccesses],
+    }
+
+def run_parallel(suite, jobs):
+    """
+    Run each test class in its own worker process and merge the results
+
+    Test classes are the unit of work so setUpClass/tearDownClass still run
+    once per class. Tests that failed to import are run in this process.
+    """
+    class_names = []
+    in_process = unittest.TestSuite()
+    for test in iter_test_cases(suite):
+        cls = type(test)
+        if cls.__module__.startswith('unittest.'):
+            in_process.addTest(test)
+            continue
+        name = f"{cls.__module__}.{cls.__qualname__}"
+        if name not in class_names:
+            class_names.append(name)
+
+    merged = unittest.TestResult()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for outcome in executor.map(run_test_class, class_names):
+            sys.stderr.write(outcome['output'])
+            merged.testsRun += outcome['testsRun']
+            merged.failures.extend(outcome['failures'])
+            merged.errors.extend(outcome['errors'])
+            merged.skipped.extend(outcome['skipped'])
+            merged.expectedFailures.extend(outcome['expectedFailures'])
+            merged.unexpectedSuccesses.extend(outcome['unexpectedSuccesses'])
+    if in_process.countTestCases():
+        in_process.run(merged)
+    elapsed = time.perf_counter() - start
+
+    sys.stderr.write(f"\nRan {merged.testsRun} tests in {elapsed:.3f}s ({jobs} workers)\n\n")
+    sys.stderr.write("OK\n" if merged.wasSuccessful() else
+                     f"FAILED (failures={len(merged.failures)}, errors={len(merged.errors)})\n")
+    return merged
+
+def discover_and_run_tests(jobs=1):
+    """
+    Discover and run all tests in the tests directory
+
+    Args:
+        jobs (int): Number of worker processes; 1 runs the suite serially
+    """
     # Discover tests in the tests directory
     loader = unittest.TestLoader()
     suite = loader.discover('tests', pattern='test_*.py')
     
-    # Run tests with verbosity
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    if jobs > 1:
+        result = run_parallel(suite, jobs)
+    else:
+        # Run tests with verbosity
+        runner = unittest.TextTestRunner(verbosity=2)
+        result = runner.run(suite)
     
     # Generate test report
     generate_test_report(result)
@@ -34,45 +115,44 @@ def generate_test_report(result):
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     report_file = os.path.join(report_dir, f'test_report_{timestamp}.txt')
     
+    # Collect the report lines, then join and write them with a single call
+    passed = result.testsRun - len(result.failures) - len(result.errors)
+    lines = [
+        SEP + "TEST REPORT",
+        SEP + f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+        f"Tests run: {result.testsRun}",
+        f"Successes: {passed}",
+        f"Failures: {len(result.failures)}",
+        f"Errors: {len(result.errors)}",
+        f"Success rate: {passed / result.testsRun * 100:.1f}%\n",
+    ]
+    
+    for title, outcomes in (("FAILURES", result.failures), ("ERRORS", result.errors)):
+        if outcomes:
+            lines.append(SEP + title + "\n" + SEP.rstrip("\n"))
+            lines.extend(f"\n{test}\n{DASH}{traceback}" for test, traceback in outcomes)
+    
+    if result.wasSuccessful():
+        lines.append("\n" + SEP + "ALL TESTS PASSED! ✓\n" + SEP.rstrip("\n"))
+    
+    body = "\n".join(lines) + "\n"
     with open(report_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("TEST REPORT\n")
-        f.write("=" * 80 + "\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        
-        f.write(f"Tests run: {result.testsRun}\n")
-        f.write(f"Successes: {result.testsRun - len(result.failures) - len(result.errors)}\n")
-        f.write(f"Failures: {len(result.failures)}\n")
-        f.write(f"Errors: {len(result.errors)}\n")
-        f.write(f"Success rate: {(result.testsRun - len(result.failures) - len(result.errors)) / result.testsRun * 100:.1f}%\n\n")
-        
-        if result.failures:
-            f.write("=" * 80 + "\n")
-            f.write("FAILURES\n")
-            f.write("=" * 80 + "\n")
-            for test, traceback in result.failures:
-                f.write(f"\n{test}\n")
-                f.write("-" * 80 + "\n")
-                f.write(traceback + "\n")
-        
-        if result.errors:
-            f.write("=" * 80 + "\n")
-            f.write("ERRORS\n")
-            f.write("=" * 80 + "\n")
-            for test, traceback in result.errors:
-                f.write(f"\n{test}\n")
-                f.write("-" * 80 + "\n")
-                f.write(traceback + "\n")
-        
-        if result.wasSuccessful():
-            f.write("\n" + "=" * 80 + "\n")
-            f.write("ALL TESTS PASSED! ✓\n")
-            f.write("=" * 80 + "\n")
+        f.write(body)
     
     print(f"\n📊 Test report saved to: {report_file}")
     return report_file
 
 if __name__ == '__main__':
-    exit_code = discover_and_run_tests()
+    parser = argparse.ArgumentParser(description="Run all unit tests and write a test report")
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes, one test class per task (default: 1, 0 = one per CPU)"
+    )
+    args = parser.parse_args()
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    exit_code = discover_and_run_tests(jobs)
     sys.exit(exit_code)
 
@@ -1,2 +1,55 @@
 # Tests package
+#
+# Test modules import from this package before the modules under test:
+# importing it puts those modules on sys.path.
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
 
+# Make the modules under test importable, once for every test module
+_PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PYTHON_DIR not in sys.path:
+    sys.path.insert(0, _PYTHON_DIR)
+
+import config_singleton
+from config_loader import get_default_config
+
+
+class TempDirTestCase(unittest.TestCase):
+    """
+    TestCase with one temporary directory shared by the tests of the class
+
+    Per-test files are named after the test (see temp_path), so tests stay
+    independent in the shared directory.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the shared temporary directory"""
+        super().setUpClass()
+        cls.test_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared temporary directory"""
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def temp_path(self, suffix):
+        """Return a path in the shared directory named after the current test"""
+        return os.path.join(self.test_dir, f'{self._testMethodName}{suffix}')
+
+
+def use_default_config(test):
+    """
+    Share the built-in default config for the duration of a test
+
+    The test then never loads the repository's config.yaml, which would
+    leave its JSON sidecar (config.yaml.json) in the source tree.
+    """
+    patcher = patch.object(config_singleton, '_config', get_default_config())
+    patcher.start()
+    test.addCleanup(patcher.stop)
@@ -1,55 +1,103 @@
 """
 Unit tests for config_loader.py
 """
-import unittest
 import os
-import tempfile
 import yaml
-import sys
+from collections import OrderedDict
+from unittest.mock import patch
 
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from config_loader import load_config, get_path, get_default_config
+from tests import TempDirTestCase
 from tests.test_data import SAMPLE_CONFIG
+import config_loader
+import config_singleton
+from config_loader import load_config, get_path, get_default_config, clear_config_cache
+
+# Write fixtures with libyaml's emitter when available, like the loader reads them
+YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
 
 
-class TestConfigLoader(unittest.TestCase):
+class TestConfigLoader(TempDirTestCase):
     """Test cases for config_loader module"""
     
     def setUp(self):
         """Set up test fixtures"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_config_path = os.path.join(self.test_dir, 'test_config.yaml')
-    
-    def tearDown(self):
-        """Clean up after tests"""
-        import shutil
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        self.test_config_path = self.temp_path('.yaml')
     
     def test_get_default_config(self):
         """Test that default config is returned correctly"""
         config = get_default_config()
         
         self.assertIsInstance(config, dict)
-        self.assertIn('paths', config)
-        self.assertIn('apify', config)
-        self.assertIn('processing', config)
-        self.assertIn('sql', config)
-        self.assertIn('logging', config)
+        self.assertLessEqual({'paths', 'apify', 'processing', 'sql', 'logging'}, config.keys())
     
     def test_load_config_with_valid_file(self):
         """Test loading config from valid YAML file"""
         # Create a test config file
         with open(self.test_config_path, 'w') as f:
-            yaml.dump(SAMPLE_CONFIG, f)
+            yaml.dump(SAMPLE_CONFIG, f, Dumper=YamlDumper)
         
         config = load_config(self.test_config_path)
         
         self.assertEqual(config['paths']['default_raw_json'], 'test_raw.json')
         self.assertEqual(config['apify']['default_max_places'], 25)
     
+    def test_load_config_cached_until_file_changes(self):
+        """Test that repeat loads are cached and edits to the file are picked up"""
+        with open(self.test_config_path, 'w') as f:
+            yaml.dump(SAMPLE_CONFIG, f, Dumper=YamlDumper)
+
+        first = load_config(self.test_config_path)
+        first['paths']['default_raw_json'] = 'mutated.json'
+        second = load_config(self.test_config_path)
+
+        # Cached result is returned as a copy, unaffected by caller mutation
+        self.assertEqual(second['paths']['default_raw_json'], 'test_raw.json')
+
+        updated = dict(SAMPLE_CONFIG, apify={'default_max_places': 50})
+        with open(self.test_config_path, 'w') as f:
+            yaml.dump(updated, f, Dumper=YamlDumper)
+
+        config = load_config(self.test_config_path)
+        self.assertEqual(config['apify']['default_max_places'], 50)
+
+    def test_load_config_cache_evicts_least_recently_used(self):
+        """Test that the config cache stays bounded, dropping the oldest path first"""
+        paths = []
+        for name in ('a', 'b', 'c'):
+            path = self.temp_path(f'_{name}.yaml')
+            with open(path, 'w') as f:
+                yaml.dump(SAMPLE_CONFIG, f, Dumper=YamlDumper)
+            paths.append(os.path.abspath(path))
+
+        with patch.object(config_loader, '_CONFIG_CACHE', OrderedDict()), \
+                patch.object(config_loader, '_CONFIG_CACHE_SIZE', 2):
+            load_config(paths[0])
+            load_config(paths[1])
+            load_config(paths[0])  # a.yaml becomes most recently used
+            load_config(paths[2])
+
+            self.assertEqual(list(config_loader._CONFIG_CACHE), [paths[0], paths[2]])
+
+    def test_load_config_uses_json_sidecar(self):
+        """Test that the JSON sidecar replaces YAML parsing until the YAML file changes"""
+        with open(self.test_config_path, 'w') as f:
+            yaml.dump(SAMPLE_CONFIG, f, Dumper=YamlDumper)
+
+        expected = load_config(self.test_config_path)
+        self.assertTrue(os.path.exists(self.test_config_path + '.json'))
+
+        clear_config_cache()
+        with patch.object(yaml, 'load', side_effect=AssertionError("YAML parsed")):
+            self.assertEqual(load_config(self.test_config_path), expected)
+
+        updated = dict(SAMPLE_CONFIG, apify={'default_max_places': 50})
+        with open(self.test_config_path, 'w') as f:
+            yaml.dump(updated, f, Dumper=YamlDumper)
+
+        clear_config_cache()
+        config = load_config(self.test_config_path)
+        self.assertEqual(config['apify']['default_max_places'], 50)
+
     def test_load_config_with_invalid_file(self):
         """Test loading config with invalid file path"""
         invalid_path = os.path.join(self.test_dir, 'nonexistent.yaml')
@@ -59,10 +107,20 @@ class TestConfigLoader(unittest.TestCase):
         self.assertIsInstance(config, dict)
         self.assertIn('paths', config)
     
+    def test_load_config_with_unreadable_path(self):
+        """Test loading config from a path that exists but can't be opened"""
+        # A directory: open() raises IsADirectoryError, not FileNotFoundError
+        config = load_config(self.test_dir)
+        
+        # Should return default config
+        self.assertEqual(config, get_default_config())
+    
     def test_load_config_with_none_path(self):
         """Test loading config with None path (should search for config.yaml)"""
-        # This will use default config if config.yaml doesn't exist
-        config = load_config(None)
+        # This will use default config if config.yaml doesn't exist.
+        # The repository's config.yaml is in the source tree: don't leave a JSON sidecar there
+        with patch.object(config_loader, '_write_json_sidecar'):
+            config = load_config(None)
         
         self.assertIsInstance(config, dict)
         self.assertIn('paths', config)
@@ -109,6 +167,36 @@ class TestConfigLoader(unittest.TestCase):
         self.assertEqual(value, 'default')
 
 
-if __name__ == '__main__':
-    unittest.main()
+class TestConfigSingleton(TempDirTestCase):
+    """Test cases for config_singleton module"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Write the test config once for all tests of this class"""
+        super().setUpClass()
+        cls.test_config_path = os.path.join(cls.test_dir, 'test_config.yaml')
+        with open(cls.test_config_path, 'w') as f:
+            yaml.dump(SAMPLE_CONFIG, f, Dumper=YamlDumper)
 
+    def setUp(self):
+        """Set up test fixtures"""
+        # Start every test without a shared config and restore the real one afterwards
+        patcher = patch.object(config_singleton, '_config', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_returns_same_config(self):
+        """Test that get() loads once and then returns the shared config"""
+        # Loads the repository's config.yaml: don't leave a JSON sidecar in the source tree
+        with patch.object(config_loader, '_write_json_sidecar'):
+            config = config_singleton.get()
+
+        self.assertIsInstance(config, dict)
+        self.assertIs(config_singleton.get(), config)
+
+    def test_reload_replaces_shared_config(self):
+        """Test that reload() loads the given file and shares it"""
+        config = config_singleton.reload(self.test_config_path)
+
+        self.assertEqual(config['paths']['default_raw_json'], 'test_raw.json')
+        self.assertIs(config_singleton.get(), config)
@@ -1,83 +1,132 @@
 """
 Unit tests for crawl_places.py
 """
-import unittest
 import os
-import sys
+import gzip
 import json
-import tempfile
-from unittest.mock import Mock, patch, MagicMock
-
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from unittest.mock import patch
 
+from tests import TempDirTestCase, use_default_config
+from tests.test_data import SAMPLE_APIFY_RESPONSE
 # Import crawl_places at module level
 import crawl_places
-from tests.test_data import SAMPLE_APIFY_RESPONSE
 
 
-class TestCrawlPlaces(unittest.TestCase):
+class FakeApifyClient:
+    """Stand-in for ApifyClient: one actor run whose dataset yields the given items"""
+
+    def __init__(self, items):
+        self.items = items
+        self.run_inputs = []
+
+    def actor(self, actor_id):
+        return self
+
+    def call(self, run_input=None):
+        self.run_inputs.append(run_input)
+        return {'id': 'test_run_id', 'defaultDatasetId': 'test_dataset_id'}
+
+    def dataset(self, dataset_id):
+        return self
+
+    def iterate_items(self):
+        return iter(self.items)
+
+
+class TestCrawlPlaces(TempDirTestCase):
     """Test cases for crawl_places module"""
-    
+
     def setUp(self):
         """Set up test fixtures"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_output_path = os.path.join(self.test_dir, 'test_output.json')
+        self.test_output_path = self.temp_path('.json')
         self.test_query = "coffee shop, Ho Chi Minh City"
-    
-    def tearDown(self):
-        """Clean up after tests"""
-        import shutil
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
-    
-    @patch('crawl_places.ApifyClient')
-    def test_crawl_raw_success(self, mock_client_class):
-        """Test successful crawling of places"""
-        # Mock Apify client
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
-        
-        # Mock actor call - create a proper mock chain
-        mock_actor = MagicMock()
-        mock_run_result = {
-            'id': 'test_run_id',
-            'defaultDatasetId': 'test_dataset_id'
-        }
-        mock_actor.call.return_value = mock_run_result
-        mock_client.actor.return_value = mock_actor
-        
-        # Mock dataset items
-        mock_dataset = MagicMock()
-        mock_dataset_items = MagicMock()
-        mock_dataset_items.items = SAMPLE_APIFY_RESPONSE
-        mock_dataset.list_items.return_value = mock_dataset_items
-        mock_client.dataset.return_value = mock_dataset
-        
+        use_default_config(self)
+
+        # Each test mocks its own client; don't reuse one cached by an earlier test
+        patcher = patch.dict(crawl_places._clients, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Fake Apify client: the actor run returns a dataset yielding SAMPLE_APIFY_RESPONSE
+        self.client = FakeApifyClient(SAMPLE_APIFY_RESPONSE)
+        self.client_tokens = []
+
+        def make_client(token):
+            self.client_tokens.append(token)
+            return self.client
+
+        patcher = patch('apify_client.ApifyClient', make_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
         # Mock APIFY_TOKEN check
-        with patch('crawl_places.APIFY_TOKEN', 'test_token'):
-            # Run the function
+        patcher = patch('crawl_places.APIFY_TOKEN', 'test_token')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_crawl_raw_success(self):
+        """Test successful crawling of places"""
+        result = crawl_places.crawl_raw(
+            query=self.test_query,
+            save_path=self.test_output_path,
+            max_crawled_places=25,
+            max_reviews=5
+        )
+
+        # Check that result is returned
+        self.assertIsInstance(result, list)
+        self.assertEqual(len(result), len(SAMPLE_APIFY_RESPONSE))
+
+        # Check that output file is created
+        self.assertTrue(os.path.exists(self.test_output_path))
+
+        # Check that data is saved correctly
+        with open(self.test_output_path, 'r', encoding='utf-8') as f:
+            saved_data = json.load(f)
+
+        self.assertEqual(len(saved_data), len(SAMPLE_APIFY_RESPONSE))
+        self.assertEqual(saved_data[0]['place_id'], SAMPLE_APIFY_RESPONSE[0]['placeId'])
+
+    def test_crawl_raw_reuses_client(self):
+        """Test that repeated crawls share one Apify client"""
+        for _ in range(2):
             result = crawl_places.crawl_raw(
                 query=self.test_query,
-                save_path=self.test_output_path,
-                max_crawled_places=25,
-                max_reviews=5
+                save_path=self.test_output_path
             )
-            
-            # Check that result is returned
-            self.assertIsInstance(result, list)
             self.assertEqual(len(result), len(SAMPLE_APIFY_RESPONSE))
-            
-            # Check that output file is created
-            self.assertTrue(os.path.exists(self.test_output_path))
-            
-            # Check that data is saved correctly
-            with open(self.test_output_path, 'r', encoding='utf-8') as f:
-                saved_data = json.load(f)
-            
-            self.assertEqual(len(saved_data), len(SAMPLE_APIFY_RESPONSE))
-            self.assertEqual(saved_data[0]['place_id'], SAMPLE_APIFY_RESPONSE[0]['placeId'])
-    
+
+        self.assertEqual(self.client_tokens, ['test_token'])
+        self.assertEqual(len(self.client.run_inputs), 2)
+
+    def test_crawl_raw_gzip_output(self):
+        """Test that a .gz save path is written gzip-compressed"""
+        gz_path = self.test_output_path + '.gz'
+
+        crawl_places.crawl_raw(query=self.test_query, save_path=gz_path)
+
+        with gzip.open(gz_path, 'rt', encoding='utf-8') as f:
+            saved_data = json.load(f)
+        self.assertEqual(len(saved_data), len(SAMPLE_APIFY_RESPONSE))
+        self.assertFalse(os.path.exists(f'{gz_path}.{os.getpid()}.tmp'))
+
+    def test_crawl_raw_failure_keeps_previous_output(self):
+        """Test that a crawl failing mid-write leaves the existing file untouched"""
+        def failing_items():
+            yield SAMPLE_APIFY_RESPONSE[0]
+            raise ConnectionError("dataset stream interrupted")
+
+        self.client.iterate_items = failing_items
+        with open(self.test_output_path, 'w', encoding='utf-8') as f:
+            f.write('[]')
+
+        with self.assertRaises(ConnectionError):
+            crawl_places.crawl_raw(query=self.test_query, save_path=self.test_output_path)
+
+        with open(self.test_output_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), [])
+        self.assertFalse(os.path.exists(f'{self.test_output_path}.{os.getpid()}.tmp'))
+
     def test_crawl_raw_no_token(self):
         """Test error when APIFY_TOKEN is not set"""
         # Mock APIFY_TOKEN as None
@@ -87,85 +136,32 @@ class TestCrawlPlaces(unittest.TestCase):
                     query=self.test_query,
                     save_path=self.test_output_path
                 )
-            
+
             self.assertIn('APIFY_TOKEN', str(context.exception))
-    
-    @patch('crawl_places.ApifyClient')
-    def test_crawl_raw_data_transformation(self, mock_client_class):
+
+    def test_crawl_raw_data_transformation(self):
         """Test that Apify data is transformed correctly"""
-        # Mock Apify client
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
-        
-        # Mock actor call
-        mock_actor = MagicMock()
-        mock_run_result = {
-            'id': 'test_run_id',
-            'defaultDatasetId': 'test_dataset_id'
-        }
-        mock_actor.call.return_value = mock_run_result
-        mock_client.actor.return_value = mock_actor
-        
-        # Mock dataset items
-        mock_dataset = MagicMock()
-        mock_dataset_items = MagicMock()
-        mock_dataset_items.items = SAMPLE_APIFY_RESPONSE
-        mock_dataset.list_items.return_value = mock_dataset_items
-        mock_client.dataset.return_value = mock_dataset
-        
-        # Mock APIFY_TOKEN
-        with patch('crawl_places.APIFY_TOKEN', 'test_token'):
-            # Run the function
-            result = crawl_places.crawl_raw(
-                query=self.test_query,
-                save_path=self.test_output_path
-            )
-            
-            # Check data transformation
-            self.assertEqual(result[0]['place_id'], SAMPLE_APIFY_RESPONSE[0]['placeId'])
-            self.assertEqual(result[0]['name'], SAMPLE_APIFY_RESPONSE[0]['title'])
-            self.assertEqual(result[0]['rating'], SAMPLE_APIFY_RESPONSE[0]['totalScore'])
-            self.assertEqual(result[0]['user_ratings_total'], SAMPLE_APIFY_RESPONSE[0]['reviewsCount'])
-    
-    @patch('crawl_places.ApifyClient')
-    def test_crawl_raw_reviews_transformation(self, mock_client_class):
-        """Test that reviews are transformed correctly"""
-        # Mock Apify client
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
-        
-        # Mock actor call
-        mock_actor = MagicMock()
-        mock_run_result = {
-            'id': 'test_run_id',
-            'defaultDatasetId': 'test_dataset_id'
-        }
-        mock_actor.call.return_value = mock_run_result
-        mock_client.actor.return_value = mock_actor
-        
-        # Mock dataset items
-        mock_dataset = MagicMock()
-        mock_dataset_items = MagicMock()
-        mock_dataset_items.items = SAMPLE_APIFY_RESPONSE
-        mock_dataset.list_items.return_value = mock_dataset_items
-        mock_client.dataset.return_value = mock_dataset
-        
-        # Mock APIFY_TOKEN
-        with patch('crawl_places.APIFY_TOKEN', 'test_token'):
-            # Run the function
-            result = crawl_places.crawl_raw(
-                query=self.test_query,
-                save_path=self.test_output_path
-            )
-            
-            # Check reviews transformation
-            self.assertEqual(len(result[0]['reviews']), len(SAMPLE_APIFY_RESPONSE[0]['reviews']))
-            self.assertEqual(result[0]['reviews'][0]['author_name'], 
-                             SAMPLE_APIFY_RESPONSE[0]['reviews'][0]['name'])
-            self.assertEqual(result[0]['reviews'][0]['rating'], 
-                             SAMPLE_APIFY_RESPONSE[0]['reviews'][0]['stars'])
+        result = crawl_places.crawl_raw(
+            query=self.test_query,
+            save_path=self.test_output_path
+        )
 
+        # Check data transformation
+        self.assertEqual(result[0]['place_id'], SAMPLE_APIFY_RESPONSE[0]['placeId'])
+        self.assertEqual(result[0]['name'], SAMPLE_APIFY_RESPONSE[0]['title'])
+        self.assertEqual(result[0]['rating'], SAMPLE_APIFY_RESPONSE[0]['totalScore'])
+        self.assertEqual(result[0]['user_ratings_total'], SAMPLE_APIFY_RESPONSE[0]['reviewsCount'])
 
-if __name__ == '__main__':
-    unittest.main()
+    def test_crawl_raw_reviews_transformation(self):
+        """Test that reviews are transformed correctly"""
+        result = crawl_places.crawl_raw(
+            query=self.test_query,
+            save_path=self.test_output_path
+        )
 
+        # Check reviews transformation
+        self.assertEqual(len(result[0]['reviews']), len(SAMPLE_APIFY_RESPONSE[0]['reviews']))
+        self.assertEqual(result[0]['reviews'][0]['author_name'],
+                         SAMPLE_APIFY_RESPONSE[0]['reviews'][0]['name'])
+        self.assertEqual(result[0]['reviews'][0]['rating'],
+                         SAMPLE_APIFY_RESPONSE[0]['reviews'][0]['stars'])
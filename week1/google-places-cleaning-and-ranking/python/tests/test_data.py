@@ -132,3 +132,11 @@ SAMPLE_CONFIG = {
     }
 }
 
+
+# Sample cleaned CSV content (as written by transform_data) for load/rank tests
+SAMPLE_CLEAN_CSV = """place_id,name,rating,user_ratings_total,latitude,longitude,address,types
+p1,Cafe One,4.5,85,10.1,106.1,1 Test Street,['cafe']
+p2,Cafe Two,4.5,120,10.2,106.2,2 Test Street,['cafe']
+p3,Cafe Three,3.9,1000,10.3,106.3,,['cafe']
+p4,Spa One,4.8,10,10.4,106.4,4 Test Street,['spa']
+"""
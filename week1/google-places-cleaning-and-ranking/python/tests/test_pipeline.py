@@ -0,0 +1,98 @@
+"""
+Unit tests for pipeline.py
+"""
+import os
+import csv
+import sqlite3
+
+from tests import TempDirTestCase
+from tests.test_data import SAMPLE_CLEAN_CSV
+from pipeline import load_and_rank
+
+
+class TestLoadAndRank(TempDirTestCase):
+    """Test cases for pipeline.load_and_rank"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Write the clean CSV once for all tests of this class"""
+        super().setUpClass()
+        cls.test_clean_path = os.path.join(cls.test_dir, 'test_clean.csv')
+
+        with open(cls.test_clean_path, 'w', encoding='utf-8-sig', newline='') as f:
+            f.write(SAMPLE_CLEAN_CSV)
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_db_path = self.temp_path('.db')
+        self.test_ranked_path = self.temp_path('_ranked.csv')
+
+    def _read_ranked(self):
+        with open(self.test_ranked_path, 'r', encoding='utf-8-sig', newline='') as f:
+            return list(csv.DictReader(f))
+
+    def test_load_and_rank_outputs(self):
+        """Test that database and ranked CSV are created"""
+        db_path, ranked_path = load_and_rank(
+            self.test_clean_path, self.test_db_path, self.test_ranked_path
+        )
+
+        self.assertEqual(db_path, self.test_db_path)
+        self.assertEqual(ranked_path, self.test_ranked_path)
+        self.assertTrue(os.path.exists(self.test_db_path))
+
+        rows = self._read_ranked()
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(
+            list(rows[0].keys()),
+            ['place_id', 'name', 'rating', 'user_ratings_total', 'category', 'rating_rank']
+        )
+
+    def test_load_and_rank_numeric_ordering(self):
+        """Test that ratings and review counts are ranked numerically within a category"""
+        load_and_rank(self.test_clean_path, self.test_db_path, self.test_ranked_path)
+
+        cafes = [row for row in self._read_ranked() if row['category'] == "'cafe'"]
+
+        # 120 reviews outranks 85 at equal rating (text comparison would invert this)
+        self.assertEqual([row['place_id'] for row in cafes], ['p2', 'p1', 'p3'])
+        self.assertEqual([row['rating_rank'] for row in cafes], ['1', '2', '3'])
+
+    def test_load_and_rank_keeps_number_formats(self):
+        """Test that numeric columns are typed from their values, as pandas read_csv did"""
+        # Whole-number ratings stay integers; review counts written as x.0 stay decimals
+        clean_path = self.temp_path('.csv')
+        with open(clean_path, 'w', encoding='utf-8-sig', newline='') as f:
+            f.write("place_id,name,rating,user_ratings_total,types\n"
+                    "p1,Spa One,4,12.0,['spa']\n"
+                    "p2,Spa Two,5,30.0,['spa']\n")
+
+        load_and_rank(clean_path, self.test_db_path, self.test_ranked_path)
+
+        self.assertEqual(
+            [(row['rating'], row['user_ratings_total']) for row in self._read_ranked()],
+            [('5', '30.0'), ('4', '12.0')]
+        )
+
+    def test_load_and_rank_missing_values_stored_as_null(self):
+        """Test that empty CSV cells are loaded as NULL"""
+        load_and_rank(self.test_clean_path, self.test_db_path, self.test_ranked_path)
+
+        conn = sqlite3.connect(self.test_db_path)
+        try:
+            address = conn.execute(
+                "SELECT address FROM places WHERE place_id = 'p3'"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+        self.assertIsNone(address)
+
+    def test_load_and_rank_file_not_found(self):
+        """Test error handling when the clean CSV doesn't exist"""
+        nonexistent_path = os.path.join(self.test_dir, 'nonexistent.csv')
+
+        with self.assertRaises(FileNotFoundError):
+            load_and_rank(nonexistent_path, self.test_db_path, self.test_ranked_path)
+
+        self.assertFalse(os.path.exists(self.test_db_path))
@@ -1,38 +1,33 @@
 """
 Unit tests for transform_data.py
 """
-import unittest
 import os
-import sys
-import json
-import tempfile
+import gzip
+import orjson
 import pandas as pd
 
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from transform_data import transform_data
+from tests import TempDirTestCase, use_default_config
 from tests.test_data import EXPECTED_TRANSFORMED_DATA
+from transform_data import transform_data
 
 
-class TestTransformData(unittest.TestCase):
+class TestTransformData(TempDirTestCase):
     """Test cases for transform_data module"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_input_path = os.path.join(self.test_dir, 'test_input.json')
-        self.test_output_path = os.path.join(self.test_dir, 'test_output.csv')
+    @classmethod
+    def setUpClass(cls):
+        """Write the test input JSON once for all tests of this class"""
+        super().setUpClass()
+        cls.test_input_path = os.path.join(cls.test_dir, 'test_input.json')
         
         # Create test input JSON file
-        with open(self.test_input_path, 'w', encoding='utf-8') as f:
-            json.dump(EXPECTED_TRANSFORMED_DATA, f, ensure_ascii=False, indent=2)
-    
-    def tearDown(self):
-        """Clean up after tests"""
-        import shutil
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        with open(cls.test_input_path, 'wb') as f:
+            f.write(orjson.dumps(EXPECTED_TRANSFORMED_DATA))
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_output_path = self.temp_path('.csv')
+        use_default_config(self)
     
     def test_transform_data_basic(self):
         """Test basic data transformation"""
@@ -55,12 +50,23 @@ class TestTransformData(unittest.TestCase):
             output_csv_path=self.test_output_path
         )
         
-        expected_columns = ['place_id', 'name', 'rating', 'user_ratings_total', 
-                          'latitude', 'longitude', 'address', 'types']
+        expected_columns = {'place_id', 'name', 'rating', 'user_ratings_total',
+                            'latitude', 'longitude', 'address', 'types'}
         
-        for col in expected_columns:
-            self.assertIn(col, df.columns, f"Column {col} should be present")
-    
+        self.assertLessEqual(expected_columns, set(df.columns))
+
+    def test_transform_data_skips_unused_fields(self):
+        """Test that raw fields not needed for the output are not loaded"""
+        df = transform_data(
+            raw_json_path=self.test_input_path,
+            output_csv_path=self.test_output_path,
+            columns_to_save_override=['place_id', 'rating']
+        )
+
+        self.assertNotIn('reviews', df.columns)
+        self.assertNotIn('name', df.columns)
+        self.assertIn('latitude', df.columns)
+
     def test_transform_data_missing_values(self):
         """Test handling of missing values"""
         # Create data with missing values
@@ -77,8 +83,8 @@ class TestTransformData(unittest.TestCase):
         ]
         
         test_input = os.path.join(self.test_dir, 'test_missing.json')
-        with open(test_input, 'w', encoding='utf-8') as f:
-            json.dump(data_with_missing, f)
+        with open(test_input, 'wb') as f:
+            f.write(orjson.dumps(data_with_missing))
         
         df = transform_data(
             raw_json_path=test_input,
@@ -89,6 +95,37 @@ class TestTransformData(unittest.TestCase):
         self.assertEqual(df['rating'].iloc[0], 0)
         self.assertEqual(df['user_ratings_total'].iloc[0], 0)
     
+    def test_transform_data_records_without_dataframe(self):
+        """Test returning cleaned records, with numbers formatted like pandas would"""
+        data = [
+            {"place_id": "test1", "rating": None, "user_ratings_total": 12,
+             "geometry": {"lat": 10, "lng": 106.5}},
+            {"place_id": "test2", "rating": 4, "user_ratings_total": 30,
+             "geometry": None},
+        ]
+        test_input = self.temp_path('.json')
+        with open(test_input, 'wb') as f:
+            f.write(orjson.dumps(data))
+
+        places = transform_data(
+            raw_json_path=test_input,
+            output_csv_path=self.test_output_path,
+            columns_to_save_override=['place_id', 'rating', 'user_ratings_total', 'latitude'],
+            as_dataframe=False
+        )
+
+        self.assertIsInstance(places, list)
+        self.assertEqual(places[0]['rating'], 0)
+        self.assertEqual(places[1]['latitude'], None)
+
+        # Columns with gaps are float columns: whole numbers are written as e.g. 4.0
+        with open(self.test_output_path, 'r', encoding='utf-8-sig') as f:
+            self.assertEqual(f.read().splitlines(), [
+                'place_id,rating,user_ratings_total,latitude',
+                'test1,0.0,12,10.0',
+                'test2,4.0,30,',
+            ])
+
     def test_transform_data_coordinates_extraction(self):
         """Test extraction of coordinates from geometry"""
         df = transform_data(
@@ -104,6 +141,19 @@ class TestTransformData(unittest.TestCase):
         self.assertTrue(df['latitude'].notna().any())
         self.assertTrue(df['longitude'].notna().any())
     
+    def test_transform_data_gzip_input(self):
+        """Test reading gzip-compressed raw JSON"""
+        gz_input_path = self.temp_path('.json.gz')
+        with gzip.open(gz_input_path, 'wb') as f:
+            f.write(orjson.dumps(EXPECTED_TRANSFORMED_DATA))
+
+        df = transform_data(
+            raw_json_path=gz_input_path,
+            output_csv_path=self.test_output_path
+        )
+
+        self.assertEqual(len(df), len(EXPECTED_TRANSFORMED_DATA))
+
     def test_transform_data_file_not_found(self):
         """Test error handling when input file doesn't exist"""
         nonexistent_path = os.path.join(self.test_dir, 'nonexistent.json')
@@ -129,12 +179,6 @@ class TestTransformData(unittest.TestCase):
         
         # Check that only columns_to_save are in the CSV (not all DataFrame columns)
         # The CSV should only have the columns specified in config
-        expected_columns = ['place_id', 'name', 'rating', 'user_ratings_total', 
-                          'latitude', 'longitude', 'address', 'types']
-        for col in expected_columns:
-            self.assertIn(col, df_read.columns, f"Column {col} should be in CSV")
-
-
-if __name__ == '__main__':
-    unittest.main()
-
+        expected_columns = {'place_id', 'name', 'rating', 'user_ratings_total',
+                            'latitude', 'longitude', 'address', 'types'}
+        self.assertLessEqual(expected_columns, set(df_read.columns))
@@ -1,16 +1,64 @@
-import json
+import csv
+import gzip
 import os
-import pandas as pd
+import ijson
 import logging
 import argparse
-from config_loader import load_config, get_path
+import config_singleton
+from config_loader import get_path
+from logging_setup import configure_logging
 
 # Library modules shouldn't globally configure logging; defer to caller.
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
-# Load configuration
-config = load_config()
+# Raw fields read by transform_data itself, whatever the output columns are
+RAW_FIELDS_USED = frozenset({'rating', 'user_ratings_total', 'geometry', 'longtitude'})
+
+def _iter_places(f, keep):
+    """
+    Stream place records from a raw JSON array one at a time
+
+    Each record is cut down to the fields in keep as soon as it is parsed,
+    so review lists and other unused fields never reach memory in bulk.
+
+    Args:
+        f: Raw JSON file opened in binary mode
+        keep (set): Field names to keep; fields missing from a record stay missing
+    """
+    for place in ijson.items(f, 'item', use_float=True):
+        yield {key: value for key, value in place.items() if key in keep}
+
+def _is_float_column(places, column):
+    """
+    Tell whether pandas would load this field of the places as a float64 column
+
+    That is the case for numbers (not bools) mixed with floats, nulls or
+    records lacking the field, and for a field that is null or absent in
+    every record but absent from at least one (absent fields become NaN).
+    """
+    has_number = has_float = has_null = has_absent = False
+    for place in places:
+        if column not in place:
+            has_absent = True
+            continue
+        value = place[column]
+        if value is None:
+            has_null = True
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        else:
+            has_number = True
+            has_float = has_float or isinstance(value, float)
+    if has_number:
+        return has_float or has_null or has_absent
+    return has_absent
+
+def _as_float(value):
+    """Convert a number in a float column to float, as pandas stores it"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
 
 def transform_data(
     raw_json_path=None,
@@ -19,14 +67,22 @@ def transform_data(
     columns_to_save_override=None,
     default_rating_override=None,
     default_reviews_override=None,
+    as_dataframe=True,
 ):
     """
     Transform raw JSON data to cleaned CSV format
     
     Args:
-        raw_json_path (str): Path to raw JSON file. If None, uses config default.
+        raw_json_path (str): Path to raw JSON file (.json or gzip-compressed .json.gz). If None, uses config default.
         output_csv_path (str): Path to save cleaned CSV file. If None, uses config default.
+        as_dataframe (bool): Return a pandas DataFrame (default) instead of the list of
+            cleaned place dicts. Only this imports pandas.
+
+    Returns:
+        pandas.DataFrame or list: Cleaned places
     """
+    config = config_singleton.get()
+
     # Get defaults from config if not provided
     if raw_json_path is None:
         raw_data_dir = get_path(config, 'paths', 'raw_data_dir', default='../data/raw')
@@ -47,14 +103,56 @@ def transform_data(
         logger.error(f"Raw data file not found: {raw_json_path}")
         raise FileNotFoundError(f"{raw_json_path} does not exist!")
 
+    # Get columns to save from config
+    if columns_to_save_override:
+        columns_to_save = columns_to_save_override
+    else:
+        columns_to_save = get_path(config, 'processing', 'columns_to_save', default=[
+            'place_id', 'name', 'rating', 'user_ratings_total', 
+            'latitude', 'longitude', 'address', 'types'
+        ])
+    
+    # Only the output columns and the fields they are derived from are loaded
+    keep = set(columns_to_save) | RAW_FIELDS_USED
+    
     logger.info("Loading raw JSON data...")
-    with open(raw_json_path, "r", encoding="utf-8") as f:
-        raw_data = json.load(f)
+    # crawl_places writes gzip-compressed raw data when the path ends with .gz
+    opener = gzip.open if raw_json_path.endswith(".gz") else open
+    with opener(raw_json_path, "rb") as f:
+        places = list(_iter_places(f, keep))
     
-    logger.info(f"Loaded {len(raw_data)} records from JSON")
+    logger.info(f"Loaded {len(places)} records from JSON")
+    # Every field present in at least one record, like DataFrame columns
+    fields = {key for place in places for key in place}
+    fields.update(('rating', 'user_ratings_total', 'latitude', 'longitude'))
+
+    # Extract latitude and longitude from geometry
+    logger.info("Extracting coordinates from geometry...")
+    # Fix typo in column name (longtitude -> longitude)
+    has_longtitude = 'longtitude' in fields
+    fields.discard('longtitude')
+    for place in places:
+        geometry = place.get('geometry')
+        if not isinstance(geometry, dict):
+            geometry = {}
+        place['latitude'] = geometry.get('lat')
+        place['longitude'] = place.pop('longtitude', None) if has_longtitude else geometry.get('lng')
+    
+    coordinates_extracted = sum(1 for place in places if place['latitude'] is not None)
+    logger.info(f"Extracted coordinates for {coordinates_extracted} places")
 
-    df = pd.DataFrame(raw_data)
-    logger.info(f"Created DataFrame with shape: {df.shape}")
+    # Check if all columns exist
+    missing_cols = [col for col in columns_to_save if col not in fields]
+    if missing_cols:
+        logger.warning(f"Missing columns: {missing_cols}")
+        columns_to_save = [col for col in columns_to_save if col not in missing_cols]
+
+    # Decide float formatting before filling: a numeric column with gaps is float
+    # in pandas, so its whole numbers were always written as e.g. "4.0"
+    float_columns = {
+        col for col in columns_to_save
+        if _is_float_column(places, col)
+    }
 
     # Handle missing values
     logger.info("Handling missing values...")
@@ -68,9 +166,15 @@ def transform_data(
         if default_reviews_override is not None
         else get_path(config, 'processing', 'default_user_ratings_total', default=0)
     )
-    
-    missing_ratings = df['rating'].isna().sum()
-    missing_reviews = df['user_ratings_total'].isna().sum()
+    # Count and fill missing ratings and review counts in one pass
+    missing_ratings = missing_reviews = 0
+    for place in places:
+        if place.get('rating') is None:
+            place['rating'] = default_rating
+            missing_ratings += 1
+        if place.get('user_ratings_total') is None:
+            place['user_ratings_total'] = default_reviews
+            missing_reviews += 1
     if missing_ratings > 0 or missing_reviews > 0:
         logger.warning(
             "Filled %s missing ratings and %s missing review counts with defaults "
@@ -80,55 +184,31 @@ def transform_data(
             default_rating,
             default_reviews,
         )
-    
-    df['user_ratings_total'] = df['user_ratings_total'].fillna(default_reviews)
-    df['rating'] = df['rating'].fillna(default_rating)
-
-    # Extract latitude and longitude from geometry
-    logger.info("Extracting coordinates from geometry...")
-    df['latitude'] = df['geometry'].apply(lambda x: x.get('lat') if isinstance(x, dict) else None)
-    df['longitude'] = df['geometry'].apply(lambda x: x.get('lng') if isinstance(x, dict) else None)
-    
-    # Fix typo in column name (longtitude -> longitude)
-    if 'longtitude' in df.columns:
-        df['longitude'] = df['longtitude']
-        df = df.drop(columns=['longtitude'])
-    
-    coordinates_extracted = df['latitude'].notna().sum()
-    logger.info(f"Extracted coordinates for {coordinates_extracted} places")
-
-    # Get columns to save from config
-    if columns_to_save_override:
-        columns_to_save = columns_to_save_override
-    else:
-        columns_to_save = get_path(config, 'processing', 'columns_to_save', default=[
-            'place_id', 'name', 'rating', 'user_ratings_total', 
-            'latitude', 'longitude', 'address', 'types'
-        ])
-    
-    # Check if all columns exist
-    missing_cols = [col for col in columns_to_save if col not in df.columns]
-    if missing_cols:
-        logger.warning(f"Missing columns: {missing_cols}")
-        columns_to_save = [col for col in columns_to_save if col in df.columns]
 
     os.makedirs(os.path.dirname(output_csv_path) or '.', exist_ok=True)
 
     logger.info(f"Saving cleaned data to {output_csv_path}...")
-    df[columns_to_save].to_csv(output_csv_path, index=False, encoding="utf-8-sig")
-    logger.info(f"Successfully saved {len(df)} records to {output_csv_path}")
+    with open(output_csv_path, "w", encoding="utf-8-sig", newline="") as out:
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(columns_to_save)
+        writer.writerows(
+            [
+                _as_float(place.get(col)) if col in float_columns else place.get(col)
+                for col in columns_to_save
+            ]
+            for place in places
+        )
+    logger.info(f"Successfully saved {len(places)} records to {output_csv_path}")
     
-    return df
+    if not as_dataframe:
+        return places
+
+    # Imported here: pandas takes ~0.3s to import and is only needed for the DataFrame
+    import pandas as pd
+    return pd.DataFrame.from_records(places)
 
 if __name__ == "__main__":
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('transform_data.log'),
-            logging.StreamHandler()
-        ]
-    )
+    configure_logging('transform_data.log')
     parser = argparse.ArgumentParser(
         description="Transform raw JSON data to cleaned CSV format",
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -137,7 +217,7 @@ if __name__ == "__main__":
         "--input",
         type=str,
         default=None,
-        help="Path to raw JSON file (default: from config.yaml)"
+        help="Path to raw JSON file, .json or gzip-compressed .json.gz (default: from config.yaml)"
     )
     parser.add_argument(
         "--output",
@@ -180,7 +260,7 @@ if __name__ == "__main__":
     
     # Reload config if custom path provided
     if args.config:
-        config = load_config(args.config)
+        config_singleton.reload(args.config)
     
     columns_override = (
         [col.strip() for col in args.columns.split(',') if col.strip()]
@@ -194,4 +274,5 @@ if __name__ == "__main__":
         columns_to_save_override=columns_override,
         default_rating_override=args.default_rating,
         default_reviews_override=args.default_reviews,
+        as_dataframe=False,
     )
\ No newline at end of file
@@ -1,48 +1,93 @@
-import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Iterator, Optional
 
 import logging
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+logger = logging.getLogger("ingestion.worldbank")
 
-def fetch_worldbank_series(base_url: str, endpoint: str, fmt: str = "json", per_page: int = 1000, timeout: int = 30) -> Iterator[Dict[str, Any]]:
+
+def create_session(max_retries: int = 5, max_workers: int = 4) -> requests.Session:
+    """
+    Create an HTTP session that keeps its connection alive across page fetches.
+    Transient failures (429 and 5xx) are retried with exponential backoff.
+    Pass the max_workers given to fetch_worldbank_series: its pool keeps one connection per worker.
+    """
+    session = requests.Session()
+    session.headers.update({"Accept": "application/json"})
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,  # let raise_for_status report the final response
+    )
+    # One pool per host (only the API host here), with a connection for each concurrent page fetch;
+    # a smaller pool would have urllib3 discard the extra connections ("Connection pool is full")
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_worldbank_series(base_url: str, endpoint: str, fmt: str = "json", per_page: int = 1000, timeout: int = 30,
+                           session: Optional[requests.Session] = None, max_workers: int = 4) -> Iterator[Dict[str, Any]]:
     """
     Stream all records from the World Bank API for a given indicator, handling pagination.
-    Yields raw item dicts from the "data" section.
+    Yields raw item dicts from the "data" section, in page order.
+    Page 1 gives the page count; the remaining pages are then fetched by max_workers threads.
+    All pages are fetched over one session (created here if not given), reusing its connections;
+    a given session should come from create_session with the same max_workers.
     """
-    page = 1
-    logger = logging.getLogger("ingestion.worldbank")
-    while True:
+    def fetch(page: int) -> Any:
         url = f"{base_url}{endpoint}?format={fmt}&per_page={per_page}&page={page}"
-        logger.debug(f"Fetching page {page}: {url}")
-        resp = requests.get(url, timeout=timeout)
+        logger.debug("Fetching page %d: %s", page, url)
+        resp = session.get(url, timeout=timeout)
         resp.raise_for_status()
-        payload = resp.json()
-        if not isinstance(payload, list) or len(payload) < 2:
-            break
+        # Parse the body bytes directly; resp.json() decodes to str first and uses stdlib json
+        return orjson.loads(resp.content)
+
+    own_session = session is None
+    if own_session:
+        session = create_session(max_workers=max_workers)
+    try:
+        payload = fetch(1)
+        if not isinstance(payload, list) or len(payload) < 2 or not payload[1]:
+            return
         meta, data = payload[0], payload[1]
-        if not data:
-            break
-        logger.info(f"Fetched page {page} with {len(data)} records")
-        for item in data:
-            yield item
+        logger.info("Fetched page 1 with %d records", len(data))
+        yield from data
         total_pages = meta.get("pages") or 1
-        if page >= total_pages:
-            break
-        page += 1
+        if total_pages < 2:
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map() yields the pages in order, whichever finishes first
+            pages = range(2, total_pages + 1)
+            for page, payload in zip(pages, executor.map(fetch, pages)):
+                if not isinstance(payload, list) or len(payload) < 2 or not payload[1]:
+                    break
+                data = payload[1]
+                logger.info("Fetched page %d with %d records", page, len(data))
+                yield from data
+    finally:
+        if own_session:
+            session.close()
 
 
 def save_jsonl(items: Iterator[Dict[str, Any]], output_path: Path) -> int:
-    logger = logging.getLogger("ingestion.worldbank")
     output_path.parent.mkdir(parents=True, exist_ok=True)
     count = 0
-    with output_path.open("w", encoding="utf-8") as f:
+    # orjson writes UTF-8 bytes directly; a 1 MiB buffer batches the small line writes
+    with output_path.open("wb", buffering=1 << 20) as f:
         for item in items:
-            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            f.write(orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE))
             count += 1
-    logger.info(f"Saved {count} records to {output_path}")
+    logger.info("Saved %d records to %s", count, output_path)
     return count
 
 
@@ -55,14 +100,17 @@ def main(config: Dict[str, Any]) -> None:
     fmt = api_cfg.get("format", "json")
     per_page = int(api_cfg.get("per_page", 1000))
     timeout = int(api_cfg.get("timeout_sec", 30))
+    max_retries = int(api_cfg.get("max_retries", 5))
+    max_workers = int(api_cfg.get("max_workers", 4))
 
     raw_path = Path(output_cfg.get("raw_jsonl_path", "data/raw/worldbank_gdp_per_capita.jsonl"))
 
-    logger = logging.getLogger("ingestion.worldbank")
     logger.info("Starting ingestion from World Bank API")
-    items = fetch_worldbank_series(base_url, endpoint, fmt=fmt, per_page=per_page, timeout=timeout)
-    total = save_jsonl(items, raw_path)
-    logger.info(f"Ingestion completed: {total} records")
+    with create_session(max_retries, max_workers=max_workers) as session:
+        items = fetch_worldbank_series(base_url, endpoint, fmt=fmt, per_page=per_page, timeout=timeout,
+                                       session=session, max_workers=max_workers)
+        total = save_jsonl(items, raw_path)
+    logger.info("Ingestion completed: %d records", total)
 
 
 if __name__ == "__main__":
@@ -74,6 +122,8 @@ if __name__ == "__main__":
             "format": "json",
             "per_page": 1000,
             "timeout_sec": 30,
+            "max_retries": 5,
+            "max_workers": 4,
         },
         "output": {
             "raw_jsonl_path": "data/raw/worldbank_gdp_per_capita.jsonl",
@@ -1,3 +1,5 @@
+import copy
+import functools
 import yaml
 from pathlib import Path
 from typing import Dict, Any
@@ -12,6 +14,14 @@ if str(PROJECT_ROOT) not in sys.path:
 from ingestion.worldbank_gdp_per_capita import main as ingest_main
 from transform.worldbank_transform import main as transform_main
 
+try:
+    # libyaml C parser when PyYAML was built against it
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+logger = logging.getLogger("orchestration.pipeline")
+
 
 def setup_logging(config: Dict[str, Any]) -> None:
     log_cfg = config.get("logging", {})
@@ -37,9 +47,20 @@ def setup_logging(config: Dict[str, Any]) -> None:
         root.addHandler(sh)
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_config(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    # mtime_ns and size are only part of the cache key, so an edited file is parsed again
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
 def load_config(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    """
+    Load the pipeline config, parsing the YAML only when the file has changed.
+    Returns a copy, so callers cannot alter the cached config.
+    """
+    st = path.stat()
+    return copy.deepcopy(_parse_config(str(path.resolve()), st.st_mtime_ns, st.st_size))
 
 
 def run() -> None:
@@ -47,7 +68,6 @@ def run() -> None:
     cfg_path = base_dir / "config.yaml"
     config = load_config(cfg_path)
     setup_logging(config)
-    logger = logging.getLogger("orchestration.pipeline")
     logger.info("Starting pipeline")
     logger.info("Ingestion step started")
     ingest_main(config)